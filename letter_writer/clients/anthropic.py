@@ -1,12 +1,20 @@
 from .base import BaseClient, ModelSize
 from anthropic import Anthropic
 from typing import List, Dict
+from functools import lru_cache
 import typer
 
+
+@lru_cache(maxsize=1)
+def _sdk_client() -> Anthropic:
+    """SDK client shared by all ClaudeClient instances (keeps the connection pool warm)."""
+    return Anthropic()
+
+
 class ClaudeClient(BaseClient):
     def __init__(self):
         super().__init__()
-        self.client = Anthropic()
+        self.client = _sdk_client()
         self.sizes = {
             ModelSize.TINY: "claude-haiku-4-5",
             ModelSize.BASE: "claude-haiku-4-5",
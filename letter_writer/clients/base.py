@@ -2,7 +2,7 @@ import json
 import sys
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 
 class ModelVendor(Enum):
@@ -22,27 +22,36 @@ class ModelSize(Enum):
     XLARGE = "xlarge"
 
 
+# Cost configs keyed by client module name. Clients are instantiated per letter,
+# so the JSON is read once per process instead of once per instance.
+_COST_CONFIGS: Dict[str, dict] = {}
+# Resolved per-model costs keyed by (client module name, model name); they only
+# depend on the config above, and are looked up on every tracked call.
+_MODEL_COSTS: Dict[Tuple[str, str], dict] = {}
+
+
 class BaseClient:
     def __init__(self):
         self.total_cost = 0.0
-        self._costs_cache: dict | None = None
 
     def _load_cost_config(self) -> dict:
         """Load `*.json` config that sits next to the concrete client module."""
-        if self._costs_cache is not None:
-            return self._costs_cache
+        cached = _COST_CONFIGS.get(self.__module__)
+        if cached is not None:
+            return cached
 
         try:
             module_path = sys.modules[self.__module__].__file__
             config_path = Path(module_path).with_suffix(".json")
             if config_path.exists():
-                self._costs_cache = json.loads(config_path.read_text(encoding="utf-8"))
+                config = json.loads(config_path.read_text(encoding="utf-8"))
             else:
-                self._costs_cache = {}
+                config = {}
         except Exception as e:
             print(f"[WARN] Failed to load cost config for {self.__class__.__name__}: {e}")
-            self._costs_cache = {}
-        return self._costs_cache
+            config = {}
+        _COST_CONFIGS[self.__module__] = config
+        return config
 
     def get_model_cost(self, model_name: str) -> dict:
         """Retrieve cost dict for a model from the client's JSON config.
@@ -60,6 +69,13 @@ class BaseClient:
         - model override: models[model_name].search (if present)
         - otherwise: defaults.search
         """
+        key = (self.__module__, model_name)
+        costs = _MODEL_COSTS.get(key)
+        if costs is None:
+            costs = _MODEL_COSTS[key] = self._resolve_model_cost(model_name)
+        return costs
+
+    def _resolve_model_cost(self, model_name: str) -> dict:
         cfg: Any = self._load_cost_config()
         if not isinstance(cfg, dict):
             return {"input": 0.0, "output": 0.0, "search": 0.0}
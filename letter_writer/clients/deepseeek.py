@@ -1,17 +1,21 @@
 from .base import BaseClient, ModelSize
 from openai import OpenAI
 from typing import List, Dict
+from functools import lru_cache
 import os
 import typer
 
 
+@lru_cache(maxsize=1)
+def _sdk_client(api_key: str | None) -> OpenAI:
+    """SDK client shared by all DeepSeekClient instances (keeps the connection pool warm)."""
+    return OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+
+
 class DeepSeekClient(BaseClient):
     def __init__(self):
         super().__init__()
-        self.client = OpenAI(
-            api_key=os.getenv("DEEPSEEK_API_KEY"),
-            base_url="https://api.deepseek.com"
-        )
+        self.client = _sdk_client(os.getenv("DEEPSEEK_API_KEY"))
         self.sizes = {
             ModelSize.TINY: "deepseek-chat",
             ModelSize.BASE: "deepseek-chat",
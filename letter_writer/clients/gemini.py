@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Any
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any
 
 import typer
 
@@ -14,6 +15,16 @@ except Exception:  # pragma: no cover
     types = None  # type: ignore
 
 
+# Resolved pricing per model name; see GeminiClient._get_gemini_pricing.
+_PRICING: Dict[str, dict] = {}
+
+
+@lru_cache(maxsize=1)
+def _sdk_client() -> "genai.Client":
+    """SDK client shared by all GeminiClient instances (keeps the connection pool warm)."""
+    return genai.Client()
+
+
 class GeminiClient(BaseClient):
     def __init__(self):
         super().__init__()
@@ -21,7 +32,7 @@ class GeminiClient(BaseClient):
             raise ImportError(
                 "Gemini client requires the 'google-genai' package. Install it to use Gemini models."
             )
-        self.client = genai.Client()
+        self.client = _sdk_client()
         self.sizes = {
             ModelSize.TINY: "gemini-2.5-flash-lite",
             ModelSize.BASE: "gemini-2.5-flash",
@@ -37,6 +48,12 @@ class GeminiClient(BaseClient):
         - tier dict: "input": {"low": 1.25, "high": 2.50, "threshold": 200000}
         Threshold is optional and falls back to defaults.threshold.
         """
+        pricing = _PRICING.get(model_name)
+        if pricing is None:
+            pricing = _PRICING[model_name] = self._resolve_gemini_pricing(model_name)
+        return pricing
+
+    def _resolve_gemini_pricing(self, model_name: str) -> dict:
         cfg: Any = self._load_cost_config()
         if not isinstance(cfg, dict):
             return {
@@ -1,10 +1,17 @@
 from .base import BaseClient, ModelSize
 from typing import List
+from functools import lru_cache
 import os
 import typer
 import xai_sdk
 
 
+@lru_cache(maxsize=1)
+def _sdk_client(api_key: str) -> xai_sdk.Client:
+    """SDK client shared by all GrokClient instances (keeps the gRPC channel open)."""
+    return xai_sdk.Client(api_key=api_key)
+
+
 class GrokClient(BaseClient):
     def __init__(self):
         super().__init__()
@@ -13,7 +20,7 @@ class GrokClient(BaseClient):
             raise RuntimeError("XAI_API_KEY environment variable is not set")
         
         # Use OpenAI client with xAI's endpoint
-        self.client = xai_sdk.Client(api_key=api_key)
+        self.client = _sdk_client(api_key)
         self.sizes = {
             ModelSize.TINY: "grok-4-1-fast-non-reasoning",
             ModelSize.BASE: "grok-4-1-fast-reasoning", 
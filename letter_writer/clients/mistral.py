@@ -1,9 +1,18 @@
 from .base import BaseClient, ModelSize
 from mistralai import Mistral
 from typing import List, Dict
+from functools import lru_cache
+import json
 import os
 import typer
 
+
+@lru_cache(maxsize=1)
+def _sdk_client(api_key: str) -> Mistral:
+    """SDK client shared by all MistralClient instances (keeps the connection pool warm)."""
+    return Mistral(api_key=api_key)
+
+
 class MistralClient(BaseClient):
     """Client that talks to Mistral via the official SDK instead of hand-rolled
     HTTP requests. This avoids schema/validation errors (like the missing
@@ -17,7 +26,7 @@ class MistralClient(BaseClient):
             raise RuntimeError("MISTRAL_API_KEY environment variable is not set")
 
         # Official SDK – see https://docs.mistral.ai/getting-started/clients/
-        self.client = Mistral(api_key=api_key)
+        self.client = _sdk_client(api_key)
 
         # Map logical sizes to actual model names – tweak as needed.
         self.sizes = {
@@ -103,7 +112,6 @@ class MistralClient(BaseClient):
             search_queries = []
             for tool_call in choice.message.tool_calls:
                 if tool_call.function.name == "web_search":
-                    import json
                     args = json.loads(tool_call.function.arguments)
                     search_queries.append(args.get('query', ''))
             
@@ -1,12 +1,20 @@
 from .base import BaseClient, ModelSize
 from openai import OpenAI
 from typing import List, Dict
+from functools import lru_cache
 import typer
 
+
+@lru_cache(maxsize=1)
+def _sdk_client() -> OpenAI:
+    """SDK client shared by all OpenAIClient instances (keeps the connection pool warm)."""
+    return OpenAI()
+
+
 class OpenAIClient(BaseClient):
     def __init__(self):
         super().__init__()
-        self.client = OpenAI()
+        self.client = _sdk_client()
         self.sizes = {
             ModelSize.TINY: "gpt-5-nano",
             ModelSize.BASE: "gpt-5-mini",
@@ -1,15 +1,41 @@
+from functools import lru_cache
 from typing import List
 from pathlib import Path
 from openai import OpenAI
+import typer
 
 from .config import TRACE_DIR
 from .clients.base import BaseClient, ModelSize
 
+STYLE_INSTRUCTIONS_PATH = Path(__file__).parent / "style_instructions.txt"
+
 def get_style_instructions() -> str:
-    """Load style instructions from file."""
-    style_file = Path(__file__).parent / "style_instructions.txt"
+    """Load style instructions from file.
+
+    The file is only re-read when its mtime or size changes, so hand edits are
+    still picked up without restarting.
+    """
+    try:
+        stat = STYLE_INSTRUCTIONS_PATH.stat()
+    except FileNotFoundError:
+        return _read_style_instructions(None)
+    return _read_style_instructions((stat.st_mtime_ns, stat.st_size))
+
+def set_style_instructions(instructions: str) -> None:
+    """Overwrite the style instructions file, unless the content is unchanged.
+
+    Skipping no-op writes keeps the file's mtime, and so the ETag clients
+    revalidate against, stable.
+    """
+    if instructions == get_style_instructions():
+        return
+    STYLE_INSTRUCTIONS_PATH.write_text(instructions, encoding="utf-8")
+    _read_style_instructions.cache_clear()
+
+@lru_cache(maxsize=1)
+def _read_style_instructions(version) -> str:
     try:
-        return style_file.read_text(encoding="utf-8")
+        return STYLE_INSTRUCTIONS_PATH.read_text(encoding="utf-8")
     except FileNotFoundError:
         # Fallback to default if file doesn't exist
         return (
@@ -167,7 +193,7 @@ def human_check(letter: str, examples: List[dict], client: OpenAI) -> str:
     rewritten_examples = [ex for ex in examples if "letter_text" in ex and "negative_letter_text" in ex]
     
     if not rewritten_examples:
-        print(f"none of {', '.join(ex['company_name'] for ex in examples)} have a negative letter, skipping")
+        typer.echo(f"[INFO] none of {', '.join(ex['company_name'] for ex in examples)} have a negative letter, skipping")
         return "NO COMMENT"
 
     examples_formatted = "\n\n".join(
@@ -231,7 +257,7 @@ def rewrite_letter(
         had_feedback = True
         prompt += "========== Human Feedback:\n" + human_feedback + "\n==========\n"
     if not had_feedback:
-        print("No feedback provided, returning original letter.")
+        typer.echo("[INFO] No feedback provided, returning original letter.")
         return original_letter
     
     prompt += (
@@ -243,7 +269,7 @@ def rewrite_letter(
     (trace_dir / "rewrite_prompt.txt").write_text(prompt, encoding="utf-8")
     revised_letter = client.call(ModelSize.XLARGE, system, [prompt])
     if "NO REVISIONS" in revised_letter:
-        print("No revisions needed, returning original letter.")
+        typer.echo("[INFO] No revisions needed, returning original letter.")
         return original_letter
     return revised_letter 
 
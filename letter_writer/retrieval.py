@@ -8,13 +8,14 @@ import typer
 
 from .clients.base import BaseClient, ModelSize
 
-from .config import COLLECTION_NAME
-from .vector_store import embed
+from .vector_store import embed, search_similar
 
 import pandas as pd
 
 from pydantic import BaseModel, ValidationError
-from typing import List
+
+# Payload fields the generation pipeline reads from retrieved examples.
+RETRIEVED_PAYLOAD_FIELDS = ["company_name", "job_text", "letter_text", "negative_letter_text"]
 
 class ScoreRow(BaseModel):
     company_name: str
@@ -27,24 +28,23 @@ class ScoreTable(BaseModel):
 def retrieve_similar_job_offers(job_text: str, qdrant_client: QdrantClient, openai_client: OpenAI) -> List[ScoredPoint]:
     """Retrieve and rerank similar job offers based on the input job text."""
     vector = embed(job_text, openai_client)
-    # qdrant-client 1.16 uses query_points (search/search_points are not available here)
-    response = qdrant_client.query_points(
-        collection_name=COLLECTION_NAME,
-        query=vector,
-        limit=7,
-        with_payload=True,
-    )
-    return list(response.points or [])
+    return search_similar(qdrant_client, vector, limit=7, payload_fields=RETRIEVED_PAYLOAD_FIELDS)
 
 def select_top_documents(search_result: List[ScoredPoint], job_text: str, ai_client: BaseClient, trace_dir: Path) -> List[dict]:
 
     retrieved_docs = {r.payload["company_name"]: r.payload for r in search_result}
     top_docs = rerank_documents(job_text, retrieved_docs, ai_client, trace_dir)
-    
-    return [{
-        "score": score,
-        **retrieved_docs[name],
-    } for name, score in top_docs.items()]
+
+    # The model may echo company names with different case or spacing
+    by_norm_name = {name.strip().lower(): doc for name, doc in retrieved_docs.items()}
+    selected = []
+    for name, score in top_docs.items():
+        doc = retrieved_docs.get(name) or by_norm_name.get(str(name).strip().lower())
+        if doc is None:
+            typer.echo(f"[WARN] Reranker returned unknown company '{name}', skipping it")
+            continue
+        selected.append({"score": score, **doc})
+    return selected
 
 def rerank_documents(job_text: str, docs: dict, ai_client: BaseClient, trace_dir: Path) -> dict:
     """Ask the model to score docs and return top 3 as dicts with company_name and score."""
@@ -1,22 +1,21 @@
-from __future__ import annotations
-
-from tqdm import tqdm
-
 """Business-logic layer shared by CLI and Web API.
 Extracted from letter_writer.cli to avoid code duplication.
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import fnmatch
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 import zlib
 
-from openai import OpenAI
 from qdrant_client.http import models as qdrant_models
 from qdrant_client.models import ScoredPoint
 
 from .client import ModelVendor, get_client
-from .config import env_default
+from .config import COLLECTION_NAME, env_default
 from .document_processing import extract_letter_text
 from .generation import (
     company_research,
@@ -32,8 +31,11 @@ from .generation import (
 )
 from .retrieval import retrieve_similar_job_offers, select_top_documents
 from .vector_store import (
+    EMBED_BATCH_SIZE,
+    delete_collection,
     ensure_collection,
-    embed,
+    embed_batch,
+    get_openai_client,
     get_qdrant_client,
     upsert_documents,
     collection_exists,
@@ -45,6 +47,46 @@ __all__ = [
 ]
 
 
+def _glob_listed(listings: Dict[Path, List[str]], folder: Path, pattern: str) -> List[Path]:
+    """Equivalent of ``folder.glob(pattern)`` that lists each folder only once.
+
+    Refreshing globs the letters folders several times per job offer, which
+    rescans the whole directory every time; *listings* memoizes the scan.
+    """
+    names = listings.get(folder)
+    if names is None:
+        names = os.listdir(folder) if folder.is_dir() else []
+        listings[folder] = names
+    return [folder / name for name in fnmatch.filter(names, pattern)]
+
+
+def _embed_points(openai_client, payloads: List[dict]) -> List[qdrant_models.PointStruct]:
+    """Embed a batch of example payloads into Qdrant points."""
+    vectors = embed_batch([payload["job_text"] for payload in payloads], openai_client)
+    return [
+        qdrant_models.PointStruct(
+            id=zlib.adler32(payload["company_name"].encode()),
+            vector=vector.tolist(),
+            payload=payload,
+        )
+        for payload, vector in zip(payloads, vectors)
+    ]
+
+
+def _upsert_payloads(
+    client, openai_client, payloads: List[dict], upserter: ThreadPoolExecutor, pending: Optional[Future]
+) -> Future:
+    """Embed *payloads*, then hand them to *upserter* once *pending* is done.
+
+    Upserting one batch overlaps with embedding the next, while at most one
+    batch waits in memory for its upsert.
+    """
+    points = _embed_points(openai_client, payloads)
+    if pending is not None:
+        pending.result()
+    return upserter.submit(upsert_documents, client, points)
+
+
 def refresh_repository(
     jobs_source_folder: Path = Path(env_default("JOBS_SOURCE_FOLDER", "examples")),
     jobs_source_suffix: str = env_default("JOBS_SOURCE_SUFFIX", ".txt"),
@@ -61,14 +103,12 @@ def refresh_repository(
 ):
     """Populate or refresh the Qdrant collection used for retrieval-augmented generation."""
 
-    from .config import COLLECTION_NAME
-
-    openai_client = OpenAI()
+    openai_client = get_openai_client()
     client = get_qdrant_client(qdrant_host, qdrant_port)
 
     if clear:
         logger(f"[INFO] Resetting collection: {COLLECTION_NAME}")
-        client.delete_collection(collection_name=COLLECTION_NAME)
+        delete_collection(client)
     ensure_collection(client)
 
     logger(
@@ -84,97 +124,99 @@ def refresh_repository(
         f"[INFO] Processing negative letters from: {negative_letters_source_folder} with suffix: {negative_letters_source_suffix}"
     )
 
-    points: List[qdrant_models.PointStruct] = []
+    # Examples are embedded one batch at a time, each upserted in the background
+    # while the next is embedded, so memory stays bounded by the batch size
+    # rather than by the number of examples.
+    payloads: List[dict] = []
+    n_upserted = 0
     n_with_negative_letters = 0
     n_negative_letters = 0
     skipped = []
+    listings: Dict[Path, List[str]] = {}
 
-    for path in jobs_source_folder.glob(f"*{jobs_source_suffix}"):
-        company_name = path.stem
-        job_text = path.read_text(encoding="utf-8")
-
-        # Try exact match first, then try with wildcard for vendor-suffixed files
-        letter_path = letters_source_folder / f"{company_name}{letters_source_suffix}"
-        if not letter_path.exists():
-            # Look for vendor-suffixed files like company_name.vendor.txt
-            matching_letters = list(letters_source_folder.glob(f"{company_name}.*{letters_source_suffix}"))
-            if matching_letters:
-                # Prefer files without vendor suffix (exact match), otherwise use first match
-                exact_match = next((p for p in matching_letters if p.stem == company_name), None)
-                letter_path = exact_match if exact_match else matching_letters[0]
-                logger(f"[INFO] Using letter file: {letter_path.name} for {company_name}")
-            else:
-                logger(f"[WARN] No letter found for {company_name}. Skipping.")
-                skipped.append(company_name)
-                continue
-
-        letter_text = extract_letter_text(
-            letter_path, letters_ignore_until, letters_ignore_after
-        )
+    pending: Optional[Future] = None
+    with ThreadPoolExecutor(max_workers=1) as upserter:
+        for path in jobs_source_folder.glob(f"*{jobs_source_suffix}"):
+            company_name = path.stem
+            job_text = path.read_text(encoding="utf-8")
+
+            # Try exact match first, then try with wildcard for vendor-suffixed files
+            letter_path = letters_source_folder / f"{company_name}{letters_source_suffix}"
+            if not letter_path.exists():
+                # Look for vendor-suffixed files like company_name.vendor.txt
+                matching_letters = _glob_listed(listings, letters_source_folder, f"{company_name}.*{letters_source_suffix}")
+                if matching_letters:
+                    # Prefer files without vendor suffix (exact match), otherwise use first match
+                    exact_match = next((p for p in matching_letters if p.stem == company_name), None)
+                    letter_path = exact_match if exact_match else matching_letters[0]
+                    logger(f"[INFO] Using letter file: {letter_path.name} for {company_name}")
+                else:
+                    logger(f"[WARN] No letter found for {company_name}. Skipping.")
+                    skipped.append(company_name)
+                    continue
+
+            letter_text = extract_letter_text(
+                letter_path, letters_ignore_until, letters_ignore_after
+            )
 
-        # Look for negative letters - these are typically the vendor-suffixed files
-        # that were AI-generated before human correction
-        negative_letter_paths = list(
-            negative_letters_source_folder.glob(
-                f"{company_name}*{negative_letters_source_suffix}"
+            # Look for negative letters - these are typically the vendor-suffixed files
+            # that were AI-generated before human correction
+            negative_letter_paths = _glob_listed(
+                listings, negative_letters_source_folder, f"{company_name}*{negative_letters_source_suffix}"
             )
-        )
-        # If no negative letters found in the negative folder, check the letters folder
-        # for vendor-suffixed files (these are often the "negative" examples)
-        # Exclude the file we're using as the positive letter
-        if not negative_letter_paths:
-            if negative_letters_source_folder != letters_source_folder:
-                negative_letter_paths = list(
-                    letters_source_folder.glob(
-                        f"{company_name}.*{negative_letters_source_suffix}"
+            # If no negative letters found in the negative folder, check the letters folder
+            # for vendor-suffixed files (these are often the "negative" examples)
+            # Exclude the file we're using as the positive letter
+            if not negative_letter_paths:
+                if negative_letters_source_folder != letters_source_folder:
+                    negative_letter_paths = _glob_listed(
+                        listings, letters_source_folder, f"{company_name}.*{negative_letters_source_suffix}"
                     )
-                )
-            else:
-                # If negative folder is same as letters folder, find all vendor-suffixed files
-                # and exclude the one we're using as positive
-                all_vendor_files = list(
-                    letters_source_folder.glob(
-                        f"{company_name}.*{negative_letters_source_suffix}"
+                else:
+                    # If negative folder is same as letters folder, find all vendor-suffixed files
+                    # and exclude the one we're using as positive
+                    all_vendor_files = _glob_listed(
+                        listings, letters_source_folder, f"{company_name}.*{negative_letters_source_suffix}"
                     )
+                    negative_letter_paths = [p for p in all_vendor_files if p != letter_path]
+            if negative_letter_paths:
+                negative_letter_text = "\n\n".join(
+                    f"--Letter {i+1} --\n{p.read_text(encoding='utf-8')}"
+                    for i, p in enumerate(negative_letter_paths)
                 )
-                negative_letter_paths = [p for p in all_vendor_files if p != letter_path]
-        if negative_letter_paths:
-            negative_letter_text = "\n\n".join(
-                f"--Letter {i+1} --\n{p.read_text(encoding='utf-8')}"
-                for i, p in enumerate(negative_letter_paths)
-            )
-            n_with_negative_letters += 1
-            n_negative_letters += len(negative_letter_paths)
-            neg_debug = ", ".join(str(p.stem) for p in negative_letter_paths)
-            logger(
-                f"[INFO] Processing {company_name} with {len(negative_letter_paths)} negative letters ({neg_debug}) [{n_with_negative_letters} with negative letters in total]"
-            )
-        else:
-            negative_letter_text = None
-            logger(f"[INFO] Processing {company_name} (without negative letter)")
-
-        vector = embed(job_text, openai_client)
-        payload = {
-            "job_text": job_text,
-            "letter_text": letter_text,
-            "company_name": company_name,
-            "path": str(path),
-        }
-        if negative_letter_text is not None:
-            payload["negative_letter_text"] = negative_letter_text
-
-        points.append(
-            qdrant_models.PointStruct(
-                id=zlib.adler32(company_name.encode()),
-                vector=vector,
-                payload=payload,
-            )
-        )
-
-    if points:
-        upsert_documents(client, points)
+                n_with_negative_letters += 1
+                n_negative_letters += len(negative_letter_paths)
+                neg_debug = ", ".join(str(p.stem) for p in negative_letter_paths)
+                logger(
+                    f"[INFO] Processing {company_name} with {len(negative_letter_paths)} negative letters ({neg_debug}) [{n_with_negative_letters} with negative letters in total]"
+                )
+            else:
+                negative_letter_text = None
+                logger(f"[INFO] Processing {company_name} (without negative letter)")
+
+            payload = {
+                "job_text": job_text,
+                "letter_text": letter_text,
+                "company_name": company_name,
+                "path": str(path),
+            }
+            if negative_letter_text is not None:
+                payload["negative_letter_text"] = negative_letter_text
+            payloads.append(payload)
+            if len(payloads) >= EMBED_BATCH_SIZE:
+                pending = _upsert_payloads(client, openai_client, payloads, upserter, pending)
+                n_upserted += len(payloads)
+                payloads = []
+
+        if payloads:
+            pending = _upsert_payloads(client, openai_client, payloads, upserter, pending)
+            n_upserted += len(payloads)
+        if pending is not None:
+            pending.result()
+
+    if n_upserted:
         logger(
-            f"[INFO] Upserted {len(points)} documents to Qdrant. ({n_with_negative_letters} with negative letters, in total {n_negative_letters} negative letters). Skipped {len(skipped)} companies: {', '.join(skipped)}"
+            f"[INFO] Upserted {n_upserted} documents to Qdrant. ({n_with_negative_letters} with negative letters, in total {n_negative_letters} negative letters). Skipped {len(skipped)} companies: {', '.join(skipped)}"
         )
     else:
         logger("[WARN] No documents found to upsert.")
@@ -348,7 +390,10 @@ def write_cover_letter(
         if path is None:
             raise ValueError("Either job_text or path must be provided")
         if path.is_dir():
-            path = max(path.glob("*.txt"), key=lambda p: p.stat().st_mtime)
+            candidates = list(path.glob("*.txt"))
+            if not candidates:
+                raise ValueError(f"No .txt files found in {path}")
+            path = max(candidates, key=lambda p: p.stat().st_mtime)
             logger(f"[INFO] Using newest file in folder: {path}")
         job_text = path.read_text(encoding="utf-8")
 
@@ -362,7 +407,7 @@ def write_cover_letter(
         else:
             raise ValueError("Either company_name or path must be provided")
 
-    openai_client = OpenAI()
+    openai_client = get_openai_client()
     search_result = retrieve_similar_job_offers(job_text, qdrant_client, openai_client)
 
     letters: dict[str, dict] = {}
@@ -391,7 +436,7 @@ def write_cover_letter(
                     try:
                         letters[key] = future.result()
                     except Exception as e:
-                        logger.error(f"{key} failed: {e}")
+                        logger(f"[ERROR] {key} failed: {e}")
                     finally:
                         pbar.update()
     else:
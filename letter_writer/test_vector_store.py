@@ -0,0 +1,167 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qdrant_models
+
+from letter_writer import vector_store
+
+VECTOR_SIZE = 8
+
+# Shared by every job offer below, like the company blurb and benefits list
+# that recruiters paste into each posting.
+BOILERPLATE = (
+    "About us - we are a fast growing team and we value ownership. "
+    "What we offer: - flexible hours - remote work - a modern office - "
+    "learning budget - and a great team. • • • Apply now and join us! "
+) * 3
+
+BACKEND_OFFER = BOILERPLATE + (
+    "We are looking for a backend engineer to design distributed services in Python "
+    "and Go, operate PostgreSQL and Kafka clusters, build REST and gRPC APIs, tune "
+    "query performance, write integration tests, review pull requests, mentor junior "
+    "developers, automate deployments with Terraform on Kubernetes, monitor latency "
+    "with Prometheus dashboards, handle incident response rotations, document system "
+    "architecture decisions, and collaborate closely with product managers on roadmap "
+    "planning for payments, billing, invoicing and fraud detection features."
+)
+
+DESIGN_OFFER = BOILERPLATE + (
+    "We are hiring a product designer to shape onboarding journeys in Figma, run "
+    "usability interviews with customers, sketch wireframes, prototype animations, "
+    "maintain our typography and colour palette, craft illustrations for marketing "
+    "campaigns, partner with copywriters on tone of voice, present concepts to "
+    "stakeholders, measure conversion funnels, organise design critiques, champion "
+    "accessibility guidelines, refine iconography, and deliver pixel perfect mockups "
+    "for mobile storefronts, loyalty programmes and seasonal promotions."
+)
+
+
+def _unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _rotated(cosine: float) -> np.ndarray:
+    """Unit vector whose cosine similarity to the first basis vector is *cosine*."""
+    vector = np.zeros(VECTOR_SIZE, dtype=np.float32)
+    vector[0] = cosine
+    vector[1] = np.sqrt(1 - cosine**2)
+    return vector
+
+
+def _fake_openai():
+    """OpenAI stand-in whose embeddings are random, so distinct calls differ."""
+    rng = np.random.default_rng(0)
+    client = mock.Mock()
+    client.embeddings.create.side_effect = lambda model, input: SimpleNamespace(
+        data=[SimpleNamespace(embedding=rng.normal(size=VECTOR_SIZE).tolist())]
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    vector_store._embed_cache.clear()
+    vector_store._embed_fingerprints.clear()
+    vector_store.clear_search_cache()
+    yield
+    vector_store._embed_cache.clear()
+    vector_store._embed_fingerprints.clear()
+    vector_store.clear_search_cache()
+
+
+@pytest.fixture
+def qdrant():
+    client = QdrantClient(":memory:")
+    vector_store.ensure_collection(client, vector_size=VECTOR_SIZE)
+    vector_store.upsert_documents(client, [
+        qdrant_models.PointStruct(id=i, vector=_unit(np.eye(VECTOR_SIZE)[i]).tolist(), payload={"company_name": f"c{i}"})
+        for i in range(4)
+    ])
+    with mock.patch.object(client, "query_points", wraps=client.query_points) as query_points:
+        yield client, query_points
+
+
+def test_near_duplicate_text_reuses_cached_embedding():
+    openai_client = _fake_openai()
+    typo = BACKEND_OFFER.replace("integration tests", "integraton tests")
+
+    first = vector_store.embed(BACKEND_OFFER, openai_client)
+    second = vector_store.embed(typo, openai_client)
+
+    assert openai_client.embeddings.create.call_count == 1
+    assert second is first
+
+
+def test_different_texts_with_shared_boilerplate_are_embedded_separately():
+    openai_client = _fake_openai()
+
+    backend = vector_store.embed(BACKEND_OFFER, openai_client)
+    design = vector_store.embed(DESIGN_OFFER, openai_client)
+
+    assert openai_client.embeddings.create.call_count == 2
+    assert not np.array_equal(backend, design)
+    fingerprints = vector_store._simhash(BACKEND_OFFER) ^ vector_store._simhash(DESIGN_OFFER)
+    assert fingerprints.bit_count() > vector_store.SIMHASH_MAX_DISTANCE
+
+
+def test_search_reuses_results_for_queries_above_threshold(qdrant):
+    client, query_points = qdrant
+    fields = ["company_name"]
+
+    first = vector_store.search_similar(client, _rotated(1.0), limit=2, payload_fields=fields)
+    similar = vector_store.search_similar(client, _rotated(0.971), limit=2, payload_fields=fields)
+
+    assert query_points.call_count == 1
+    assert [p.id for p in similar] == [p.id for p in first]
+
+
+def test_search_misses_for_queries_below_threshold(qdrant):
+    client, query_points = qdrant
+    fields = ["company_name"]
+
+    vector_store.search_similar(client, _rotated(1.0), limit=2, payload_fields=fields)
+    vector_store.search_similar(client, _rotated(0.969), limit=2, payload_fields=fields)
+
+    assert query_points.call_count == 2
+
+
+def test_search_does_not_serve_expired_entries(qdrant):
+    client, query_points = qdrant
+    fields = ["company_name"]
+    now = 1000.0
+    clock = SimpleNamespace(monotonic=lambda: now)
+
+    with mock.patch.object(vector_store, "time", clock):
+        vector_store.search_similar(client, _rotated(1.0), limit=2, payload_fields=fields)
+        vector_store.search_similar(client, _rotated(1.0), limit=2, payload_fields=fields)
+        assert query_points.call_count == 1
+
+        # An expired entry serves neither near-identical nor identical queries
+        now += vector_store.SEARCH_CACHE_TTL + 1
+        vector_store.search_similar(client, _rotated(0.99), limit=2, payload_fields=fields)
+        assert query_points.call_count == 2
+
+        now += vector_store.SEARCH_CACHE_TTL + 1
+        vector_store.search_similar(client, _rotated(1.0), limit=2, payload_fields=fields)
+        assert query_points.call_count == 3
+
+
+def test_writes_clear_the_search_cache(qdrant):
+    client, query_points = qdrant
+    fields = ["company_name"]
+
+    vector_store.search_similar(client, _rotated(1.0), limit=2, payload_fields=fields)
+    vector_store.upsert_documents(client, [
+        qdrant_models.PointStruct(id=10, vector=_rotated(0.999).tolist(), payload={"company_name": "new"})
+    ])
+    results = vector_store.search_similar(client, _rotated(1.0), limit=2, payload_fields=fields)
+
+    assert query_points.call_count == 2
+    assert 10 in [p.id for p in results]
+
+    vector_store.delete_collection(client)
+    assert not vector_store._search_cache.get(client)
@@ -1,34 +1,275 @@
-from typing import List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+from threading import Lock
+import time
+from typing import Dict, List, Optional, Sequence, Set
+from weakref import WeakKeyDictionary
+import numpy as np
 import typer
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qdrant_models
+from qdrant_client.models import ScoredPoint
 from openai import OpenAI
 
-from .config import COLLECTION_NAME, EMBED_MODEL
+from .config import COLLECTION_NAME, EMBED_MODEL, env_default
+
+# Known collection names per client, so existence checks don't round-trip to
+# Qdrant every time. Only presence is trusted: a name missing from the cache is
+# re-checked on the server, since another process (e.g. a CLI refresh) may have
+# created the collection since.
+_collections_cache: "WeakKeyDictionary[QdrantClient, Set[str]]" = WeakKeyDictionary()
+
+# In-process LRU of embeddings, keyed by sha256(model + text). The same job
+# offer is routinely embedded several times (retries, multiple requests).
+EMBED_CACHE_SIZE = 1024
+_embed_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_embed_cache_lock = Lock()
+# SimHash fingerprints of the cached texts, for reusing an embedding when the
+# same job offer is pasted again with trivial edits (typos, whitespace).
+SIMHASH_MAX_DISTANCE = 3
+SIMHASH_MIN_TOKENS = 50  # distinct words
+_embed_fingerprints: Dict[str, int] = {}
+# Job offers run to a few thousand tokens; keep batches well under the
+# per-request token limit of the embeddings endpoint.
+EMBED_BATCH_SIZE = 64
+
+# Similarity search results per client, keyed by the query vector. Cleared on
+# every write made through this module; the TTL bounds staleness for writes
+# made by other processes (e.g. a CLI refresh while the server runs).
+# A query whose cosine similarity to a cached one is at least
+# SEARCH_CACHE_MIN_SIMILARITY reuses its results: re-pasting a slightly edited
+# job offer would otherwise return practically the same neighbours anyway.
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 600.0
+SEARCH_CACHE_MIN_SIMILARITY = 0.97
+_search_cache: "WeakKeyDictionary[QdrantClient, OrderedDict[str, tuple]]" = WeakKeyDictionary()
+_search_cache_lock = Lock()
+
+def _embed_cache_key(text: str) -> str:
+    return hashlib.sha256(f"{EMBED_MODEL}\0{text}".encode("utf-8")).hexdigest()
+
+def _simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of the distinct lower-cased words of *text*.
+
+    Each word counts once, so repeated stopwords and bullet markers don't
+    dominate the fingerprint. Returns None for texts with too few words.
+    """
+    tokens = sorted(set(text.lower().split()))
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return None
+    hashes = np.array(
+        [hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest() for token in tokens],
+        dtype="S8",
+    )
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(len(tokens), 64)
+    majority = bits.sum(axis=0) * 2 > len(tokens)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+def _trim_embed_cache() -> None:
+    """Evict least recently used embeddings; call with _embed_cache_lock held."""
+    while len(_embed_cache) > EMBED_CACHE_SIZE:
+        evicted, _ = _embed_cache.popitem(last=False)
+        _embed_fingerprints.pop(evicted, None)
+
+def _get_cached_embedding(key: str, fingerprint: Optional[int] = None) -> Optional[np.ndarray]:
+    """Exact cache lookup, falling back to the nearest fingerprint if given.
+
+    A fuzzy hit is also cached under *key*, so the next lookup is exact. Its
+    fingerprint is not recorded: fuzzy matches only ever compare against texts
+    that were actually embedded, so near-duplicates cannot drift in a chain.
+    """
+    with _embed_cache_lock:
+        cached = _embed_cache.get(key)
+        if cached is not None:
+            _embed_cache.move_to_end(key)
+            return cached
+        if fingerprint is None or not _embed_fingerprints:
+            return None
+        distance, nearest = min(
+            ((fp ^ fingerprint).bit_count(), k) for k, fp in _embed_fingerprints.items()
+        )
+        if distance > SIMHASH_MAX_DISTANCE:
+            return None
+        cached = _embed_cache[nearest]
+        _embed_cache.move_to_end(nearest)
+        _embed_cache[key] = cached
+        _trim_embed_cache()
+        return cached
+
+def _cache_embedding(key: str, embedding: List[float], fingerprint: Optional[int]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    # Unit length, so cosine similarity is a plain dot product
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector.setflags(write=False)
+    with _embed_cache_lock:
+        _embed_cache[key] = vector
+        _embed_cache.move_to_end(key)
+        if fingerprint is not None:
+            _embed_fingerprints[key] = fingerprint
+        _trim_embed_cache()
+    return vector
+
+def embed(text: str, client: OpenAI) -> np.ndarray:
+    """Get embedding vector for text using OpenAI, as a unit-length float32 array.
+
+    Results are cached in-process; the returned array is read-only. A text
+    that differs from a cached one only by a few words reuses its embedding.
+    """
+    key = _embed_cache_key(text)
+    fingerprint = _simhash(text)
+    cached = _get_cached_embedding(key, fingerprint)
+    if cached is not None:
+        return cached
 
-def embed(text: str, client: OpenAI) -> List[float]:
-    """Get embedding vector for text using OpenAI."""
     response = client.embeddings.create(model=EMBED_MODEL, input=text)
-    return response.data[0].embedding
+    return _cache_embedding(key, response.data[0].embedding, fingerprint)
+
+def embed_batch(texts: Sequence[str], client: OpenAI) -> List[np.ndarray]:
+    """Embed several texts, sending up to EMBED_BATCH_SIZE inputs per request.
+
+    Shares the cache with embed(); only texts without an exact cache hit are
+    sent to OpenAI (near-duplicates are embedded separately here on purpose,
+    since these vectors end up stored in Qdrant).
+    """
+    keys = [_embed_cache_key(text) for text in texts]
+    vectors = [_get_cached_embedding(key) for key in keys]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
 
-def get_qdrant_client(host: str, port: int) -> QdrantClient:
-    """Get Qdrant client instance."""
-    return QdrantClient(host=host, port=port)
+    for start in range(0, len(missing), EMBED_BATCH_SIZE):
+        batch = missing[start:start + EMBED_BATCH_SIZE]
+        response = client.embeddings.create(model=EMBED_MODEL, input=[texts[i] for i in batch])
+        for item in response.data:
+            i = batch[item.index]
+            vectors[i] = _cache_embedding(keys[i], item.embedding, _simhash(texts[i]))
+    return vectors
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Shared OpenAI client; reusing it keeps its HTTP connection pool warm."""
+    return OpenAI()
+
+@lru_cache(maxsize=8)
+def get_qdrant_client(
+    host: str,
+    port: int,
+    grpc_port: int = int(env_default("QDRANT_GRPC_PORT", "6334")),
+    prefer_grpc: bool = env_default("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes"),
+) -> QdrantClient:
+    """Get the (shared) Qdrant client instance for *host*:*port*.
+
+    gRPC is preferred by default: vectors travel as packed protobuf floats
+    instead of JSON, which is considerably cheaper for 1536-dim embeddings.
+    """
+    return QdrantClient(host=host, port=port, grpc_port=grpc_port, prefer_grpc=prefer_grpc)
+
+def _list_collections(client: QdrantClient, refresh: bool = False) -> Set[str]:
+    """Return the (cached) set of collection names on the server."""
+    names = _collections_cache.get(client)
+    if names is None or refresh:
+        names = {c.name for c in client.get_collections().collections}
+        _collections_cache[client] = names
+    return names
 
 def ensure_collection(client: QdrantClient, vector_size: int = 1536) -> None:
     """Ensure the Qdrant collection exists, create if not."""
-    if COLLECTION_NAME in [c.name for c in client.get_collections().collections]:
+    if collection_exists(client):
         return
     client.create_collection(
         collection_name=COLLECTION_NAME,
         vectors_config=qdrant_models.VectorParams(size=vector_size, distance=qdrant_models.Distance.COSINE),
+        # int8 copies of the vectors for search (4x smaller); originals are kept for rescoring
+        quantization_config=qdrant_models.ScalarQuantization(
+            scalar=qdrant_models.ScalarQuantizationConfig(
+                type=qdrant_models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            ),
+        ),
     )
+    _list_collections(client).add(COLLECTION_NAME)
+
+def delete_collection(client: QdrantClient) -> None:
+    """Delete the Qdrant collection."""
+    client.delete_collection(collection_name=COLLECTION_NAME)
+    _list_collections(client).discard(COLLECTION_NAME)
+    clear_search_cache()
+
+def clear_search_cache() -> None:
+    """Forget all cached similarity search results."""
+    with _search_cache_lock:
+        _search_cache.clear()
+
+def search_similar(
+    client: QdrantClient,
+    vector: np.ndarray,
+    limit: int,
+    payload_fields: Sequence[str],
+) -> List[ScoredPoint]:
+    """Return the *limit* points closest to *vector*, with only *payload_fields*.
+
+    Identical and near-identical queries are answered from an in-process cache.
+    """
+    query = np.asarray(vector, dtype=np.float32)
+    params = f"{limit}:{','.join(payload_fields)}"
+    key = f"{hashlib.sha256(query.tobytes()).hexdigest()}:{params}"
+    now = time.monotonic()
+    with _search_cache_lock:
+        entries = _search_cache.get(client)
+        if entries is not None:
+            hit_key = key if key in entries else _nearest_cached_query(entries, query, params, now)
+            hit = entries.get(hit_key) if hit_key is not None else None
+            if hit is not None and hit[0] > now:
+                entries.move_to_end(hit_key)
+                return list(hit[1])
+
+    # qdrant-client 1.16 uses query_points (search/search_points are not available here)
+    response = client.query_points(
+        collection_name=COLLECTION_NAME,
+        query=vector,
+        limit=limit,
+        with_payload=list(payload_fields),
+        with_vectors=False,
+    )
+    points = list(response.points or [])
+
+    norm = np.linalg.norm(query)
+    unit = query / norm if norm else query
+    with _search_cache_lock:
+        entries = _search_cache.setdefault(client, OrderedDict())
+        entries[key] = (now + SEARCH_CACHE_TTL, tuple(points), unit, params)
+        entries.move_to_end(key)
+        while len(entries) > SEARCH_CACHE_SIZE:
+            entries.popitem(last=False)
+    return points
+
+def _nearest_cached_query(
+    entries: "OrderedDict[str, tuple]", query: np.ndarray, params: str, now: float
+) -> Optional[str]:
+    """Key of the live cached query most similar to *query*, if similar enough."""
+    candidates = [(k, entry[2]) for k, entry in entries.items() if entry[3] == params and entry[0] > now]
+    if not candidates:
+        return None
+    norm = np.linalg.norm(query)
+    if not norm:
+        return None
+    similarities = np.stack([v for _, v in candidates]) @ (query / norm)
+    best = int(np.argmax(similarities))
+    if similarities[best] < SEARCH_CACHE_MIN_SIMILARITY:
+        return None
+    return candidates[best][0]
 
 def upsert_documents(client: QdrantClient, points: List[qdrant_models.PointStruct]) -> None:
     """Upsert documents to Qdrant collection."""
-    if points:
-        client.upsert(collection_name=COLLECTION_NAME, points=points)
-    
+    if not points:
+        return
+    client.upsert(collection_name=COLLECTION_NAME, points=points)
+    clear_search_cache()
+
 def collection_exists(client: QdrantClient) -> bool:
     """Check if the collection exists."""
-    return COLLECTION_NAME in [c.name for c in client.get_collections().collections] 
\ No newline at end of file
+    if COLLECTION_NAME in _collections_cache.get(client, ()):
+        return True
+    return COLLECTION_NAME in _list_collections(client, refresh=True) 
\ No newline at end of file
@@ -0,0 +1,27 @@
+import importlib
+
+from django.apps import AppConfig
+
+# Vendor SDKs are imported lazily by letter_writer.client.get_client, so the
+# first request would otherwise pay for importing all of them. Import them at
+# process start instead.
+_WARM_MODULES = (
+    "letter_writer.service",
+    "letter_writer.clients.openai",
+    "letter_writer.clients.anthropic",
+    "letter_writer.clients.gemini",
+    "letter_writer.clients.mistral",
+    "letter_writer.clients.grok",
+    "letter_writer.clients.deepseeek",
+)
+
+
+class ApiConfig(AppConfig):
+    name = "letter_writer_server.api"
+
+    def ready(self):
+        for module in _WARM_MODULES:
+            try:
+                importlib.import_module(module)
+            except ImportError as exc:
+                print(f"[WARN] Could not pre-import {module}: {exc}")
@@ -0,0 +1,59 @@
+"""Coalescing of concurrent identical requests.
+
+Letter generation takes minutes and costs money per call; a double-clicked
+submit or a retrying client should not start the whole pipeline twice.
+"""
+from concurrent.futures import Future
+from functools import wraps
+import hashlib
+from typing import Dict
+
+from django.http import HttpRequest, HttpResponse
+
+# Only the request that inserted a key ever removes it. Single dict operations
+# are atomic, so setdefault/pop need no extra lock.
+_in_flight: Dict[str, Future] = {}
+
+
+def _request_key(request: HttpRequest) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.path}\0".encode("utf-8"))
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _copy_response(response: HttpResponse) -> HttpResponse:
+    # Each request gets its own response object, since middleware may mutate it
+    return HttpResponse(
+        content=response.content,
+        status=response.status_code,
+        content_type=response["Content-Type"],
+    )
+
+
+def coalesce_identical_requests(view):
+    """Run *view* once for concurrent requests with the same method, path and body.
+
+    Requests arriving while an identical one is being processed wait for it
+    and receive a copy of its response. Nothing is cached once it completes.
+    """
+
+    @wraps(view)
+    def wrapper(request: HttpRequest, *args, **kwargs):
+        key = _request_key(request)
+        own = Future()
+        future = _in_flight.setdefault(key, own)
+        if future is not own:
+            return _copy_response(future.result())
+
+        try:
+            response = view(request, *args, **kwargs)
+            own.set_result(response)
+            return response
+        except BaseException as exc:
+            own.set_exception(exc)
+            raise
+        finally:
+            _in_flight.pop(key, None)
+
+    return wrapper
@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+import time
+from unittest import mock
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "letter_writer_server.settings")
+django.setup()
+
+from django.test import Client
+
+from letter_writer_server.api import coalesce
+
+N_REQUESTS = 5
+BODY = json.dumps({"job_text": "Backend engineer", "cv_text": "CV", "company_name": "Acme"})
+
+
+def _post_concurrently(n: int):
+    """POST the same body to /api/process-job/ from *n* threads at once."""
+    barrier = threading.Barrier(n)
+    responses = [None] * n
+
+    def post(i: int):
+        client = Client()
+        barrier.wait()
+        responses[i] = client.post("/api/process-job/", data=BODY, content_type="application/json")
+
+    threads = [threading.Thread(target=post, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return responses
+
+
+def test_identical_requests_run_once():
+    calls = []
+
+    def slow_write_cover_letter(**kwargs):
+        calls.append(kwargs)
+        time.sleep(0.5)
+        return {"openai": {"text": "Dear Acme", "cost": 0.01}}
+
+    with mock.patch("letter_writer_server.api.views.write_cover_letter", side_effect=slow_write_cover_letter):
+        responses = _post_concurrently(N_REQUESTS)
+
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [200] * N_REQUESTS
+    assert len({r.content for r in responses}) == 1
+    assert json.loads(responses[0].content)["letters"]["openai"]["text"] == "Dear Acme"
+    assert coalesce._in_flight == {}
+
+
+def test_leader_exception_reaches_every_waiter():
+    calls = []
+
+    def failing_write_cover_letter(**kwargs):
+        calls.append(kwargs)
+        time.sleep(0.5)
+        raise RuntimeError("vendor down")
+
+    with mock.patch("letter_writer_server.api.views.write_cover_letter", side_effect=failing_write_cover_letter):
+        responses = _post_concurrently(N_REQUESTS)
+
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [500] * N_REQUESTS
+    assert all(json.loads(r.content) == {"detail": "vendor down"} for r in responses)
+    assert coalesce._in_flight == {}
+
+
+def test_view_exception_propagates_to_waiters():
+    started = threading.Event()
+    release = threading.Event()
+
+    @coalesce.coalesce_identical_requests
+    def view(request):
+        started.set()
+        release.wait()
+        raise ValueError("boom")
+
+    request = mock.Mock(method="POST", path="/x", body=b"{}")
+    errors = []
+
+    def call():
+        try:
+            view(request)
+        except ValueError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    waiters = [threading.Thread(target=call) for _ in range(N_REQUESTS - 1)]
+    for thread in waiters:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join()
+
+    assert len(errors) == N_REQUESTS
+    assert all(str(exc) == "boom" for exc in errors)
+    assert coalesce._in_flight == {}
@@ -1,20 +1,42 @@
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
+import threading
 from typing import Any, Dict, List
-import urllib.error
-import urllib.request
 
-from django.http import JsonResponse, HttpRequest
+import httpx
+import orjson
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 
 from letter_writer.service import refresh_repository, write_cover_letter
 from letter_writer.client import ModelVendor
-from letter_writer.generation import get_style_instructions
+from letter_writer.generation import STYLE_INSTRUCTIONS_PATH, get_style_instructions, set_style_instructions
+
+from .coalesce import coalesce_identical_requests
 
 
 # Utility helpers
 
+# Vendor names are fixed at import time.
+_ALL_VENDORS = tuple(v.value for v in ModelVendor)
+
+
+class ORJSONResponse(HttpResponse):
+    """Drop-in for Django's JsonResponse that serializes with orjson.
+
+    numpy arrays and scalars (embeddings, pandas-derived scores) are
+    serialized natively instead of raising TypeError.
+    """
+
+    def __init__(self, data: Any, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY), **kwargs)
+
+
 def _safe_bool(value: Any) -> bool:
     if isinstance(value, bool):
         return value
@@ -26,10 +48,10 @@ def _safe_bool(value: Any) -> bool:
 def _build_kwargs(data: Dict[str, Any], param_types: Dict[str, Any]) -> Dict[str, Any]:
     """Coerce JSON values to expected parameter types."""
     kwargs: Dict[str, Any] = {}
-    for key, typ in param_types.items():
-        if key not in data or data[key] is None:
+    for key, val in data.items():
+        typ = param_types.get(key)
+        if typ is None or val is None:
             continue
-        val = data[key]
         # Special handling for Path and bool
         if typ is Path:
             kwargs[key] = Path(val)
@@ -41,12 +63,18 @@ def _build_kwargs(data: Dict[str, Any], param_types: Dict[str, Any]) -> Dict[str
             try:
                 kwargs[key] = ModelVendor(val)
             except ValueError:
-                raise ValueError(f"Invalid model_vendor '{val}'. Valid options: {[m.value for m in ModelVendor]}")
+                raise ValueError(f"Invalid model_vendor '{val}'. Valid options: {list(_ALL_VENDORS)}")
         else:
             kwargs[key] = typ(val)
     return kwargs
 
 
+@lru_cache(maxsize=1)
+def _google_translate_http() -> httpx.Client:
+    """Shared HTTP client, so translate calls reuse a kept-alive TLS connection."""
+    return httpx.Client(timeout=15, limits=httpx.Limits(max_keepalive_connections=8))
+
+
 def _translate_with_google(texts: List[str], target_language: str, source_language: str | None = None) -> List[str]:
     """Translate a list of texts using Google Translate API."""
     api_key = os.environ.get("GOOGLE_TRANSLATE_API_KEY")
@@ -56,7 +84,6 @@ def _translate_with_google(texts: List[str], target_language: str, source_langua
     if not texts:
         return []
 
-    endpoint = f"https://translation.googleapis.com/language/translate/v2?key={api_key}"
     payload: Dict[str, Any] = {
         "q": texts,
         "target": target_language,
@@ -64,20 +91,17 @@ def _translate_with_google(texts: List[str], target_language: str, source_langua
     if source_language:
         payload["source"] = source_language
 
-    request = urllib.request.Request(
-        endpoint,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-
     try:
-        with urllib.request.urlopen(request, timeout=15) as response:
-            response_data = json.loads(response.read().decode("utf-8"))
-    except urllib.error.HTTPError as exc:  # noqa: PERF203
-        error_body = exc.read().decode("utf-8") if exc.fp else str(exc)
-        raise RuntimeError(f"Google Translate API error: {error_body}") from exc
-    except urllib.error.URLError as exc:
+        response = _google_translate_http().post(
+            "https://translation.googleapis.com/language/translate/v2",
+            params={"key": api_key},
+            json=payload,
+        )
+        response.raise_for_status()
+        response_data = response.json()
+    except httpx.HTTPStatusError as exc:
+        raise RuntimeError(f"Google Translate API error: {exc.response.text}") from exc
+    except httpx.HTTPError as exc:
         raise RuntimeError(f"Failed to reach Google Translate API: {exc}") from exc
 
     translations = response_data.get("data", {}).get("translations", [])
@@ -86,87 +110,118 @@ def _translate_with_google(texts: List[str], target_language: str, source_langua
 
 # No additional business logic here; shared service functions are imported instead.
 
+# Accepted JSON fields and their parameter types, per endpoint
+_REFRESH_PARAMS: Dict[str, Any] = {
+    "jobs_source_folder": Path,
+    "jobs_source_suffix": str,
+    "letters_source_folder": Path,
+    "letters_source_suffix": str,
+    "letters_ignore_until": str,
+    "letters_ignore_after": str,
+    "negative_letters_source_folder": Path,
+    "negative_letters_source_suffix": str,
+    "qdrant_host": str,
+    "qdrant_port": int,
+    "clear": bool,
+}
+
+_PROCESS_JOB_PARAMS: Dict[str, Any] = {
+    "job_text": str,
+    "cv_text": str,
+    "company_name": str,
+    "out": Path,
+    "model_vendor": ModelVendor,
+    "qdrant_host": str,
+    "qdrant_port": int,
+    "refine": bool,
+    "fancy": bool,
+}
+
+
 @csrf_exempt
 def refresh_view(request: HttpRequest):
     if request.method != "POST":
-        return JsonResponse({"detail": "Method not allowed"}, status=405)
+        return ORJSONResponse({"detail": "Method not allowed"}, status=405)
 
     try:
         data = json.loads(request.body or "{}")
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON"}, status=400)
-
-    param_types = {
-        "jobs_source_folder": Path,
-        "jobs_source_suffix": str,
-        "letters_source_folder": Path,
-        "letters_source_suffix": str,
-        "letters_ignore_until": str,
-        "letters_ignore_after": str,
-        "negative_letters_source_folder": Path,
-        "negative_letters_source_suffix": str,
-        "qdrant_host": str,
-        "qdrant_port": int,
-        "clear": bool,
-    }
+        return ORJSONResponse({"detail": "Invalid JSON"}, status=400)
+
+    try:
+        kwargs = _build_kwargs(data, _REFRESH_PARAMS)
+    except Exception as exc:  # noqa: BLE001
+        return ORJSONResponse({"detail": str(exc)}, status=500)
+
+    if _safe_bool(data.get("background", False)):
+        # Refreshing can take minutes; don't hold the worker for it
+        threading.Thread(target=_refresh_in_background, kwargs=kwargs, daemon=True).start()
+        return ORJSONResponse({"status": "queued"}, status=202)
 
     try:
-        kwargs = _build_kwargs(data, param_types)
         refresh_repository(**kwargs, logger=print)
     except Exception as exc:  # noqa: BLE001
-        return JsonResponse({"detail": str(exc)}, status=500)
+        return ORJSONResponse({"detail": str(exc)}, status=500)
 
-    return JsonResponse({"status": "ok"})
+    return ORJSONResponse({"status": "ok"})
+
+
+def _refresh_in_background(**kwargs) -> None:
+    try:
+        refresh_repository(**kwargs, logger=print)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Background refresh failed: {exc}")
 
 
 @csrf_exempt
+@coalesce_identical_requests
 def process_job_view(request: HttpRequest):
     if request.method != "POST":
-        return JsonResponse({"detail": "Method not allowed"}, status=405)
+        return ORJSONResponse({"detail": "Method not allowed"}, status=405)
 
     try:
         data = json.loads(request.body or "{}")
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON"}, status=400)
-
-    param_types = {
-        "job_text": str,
-        "cv_text": str,
-        "company_name": str,
-        "out": Path,
-        "model_vendor": ModelVendor,
-        "qdrant_host": str,
-        "qdrant_port": int,
-        "refine": bool,
-        "fancy": bool,
-    }
+        return ORJSONResponse({"detail": "Invalid JSON"}, status=400)
 
     try:
-        kwargs = _build_kwargs(data, param_types)
+        kwargs = _build_kwargs(data, _PROCESS_JOB_PARAMS)
         letters = write_cover_letter(**kwargs, logger=print)
     except Exception as exc:  # noqa: BLE001
-        return JsonResponse({"detail": str(exc)}, status=500)
+        return ORJSONResponse({"detail": str(exc)}, status=500)
 
-    return JsonResponse({"status": "ok", "letters": letters})
+    return ORJSONResponse({"status": "ok", "letters": letters})
 
 
 @csrf_exempt
 def vendors_view(request: HttpRequest):
     if request.method != "GET":
-        return JsonResponse({"detail": "Method not allowed"}, status=405)
-    vendors = [v.value for v in ModelVendor]
-    return JsonResponse({"vendors": vendors})
+        return ORJSONResponse({"detail": "Method not allowed"}, status=405)
+    return ORJSONResponse({"vendors": list(_ALL_VENDORS)})
+
+
+def _style_instructions_etag(request: HttpRequest) -> str:
+    """ETag from the style file's mtime and size, so a 304 never reads the file."""
+    try:
+        stat = STYLE_INSTRUCTIONS_PATH.stat()
+    except FileNotFoundError:
+        return "default"
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
 
 
 @csrf_exempt
+@condition(etag_func=_style_instructions_etag)
 def style_instructions_view(request: HttpRequest):
     if request.method == "GET":
         # Return current style instructions
         try:
             instructions = get_style_instructions()
-            return JsonResponse({"instructions": instructions})
+            response = ORJSONResponse({"instructions": instructions})
+            # Let browsers keep the body but revalidate it with If-None-Match
+            patch_cache_control(response, no_cache=True)
+            return response
         except Exception as exc:
-            return JsonResponse({"detail": str(exc)}, status=500)
+            return ORJSONResponse({"detail": str(exc)}, status=500)
     
     elif request.method == "POST":
         # Update style instructions
@@ -175,46 +230,45 @@ def style_instructions_view(request: HttpRequest):
             instructions = data.get("instructions", "")
             
             if not instructions:
-                return JsonResponse({"detail": "Instructions cannot be empty"}, status=400)
+                return ORJSONResponse({"detail": "Instructions cannot be empty"}, status=400)
             
             # Write to the style instructions file
-            style_file = Path(__file__).parent.parent.parent / "letter_writer" / "style_instructions.txt"
-            style_file.write_text(instructions, encoding="utf-8")
+            set_style_instructions(instructions)
             
-            return JsonResponse({"status": "ok", "instructions": instructions})
+            return ORJSONResponse({"status": "ok", "instructions": instructions})
         except json.JSONDecodeError:
-            return JsonResponse({"detail": "Invalid JSON"}, status=400)
+            return ORJSONResponse({"detail": "Invalid JSON"}, status=400)
         except Exception as exc:
-            return JsonResponse({"detail": str(exc)}, status=500)
+            return ORJSONResponse({"detail": str(exc)}, status=500)
     
     else:
-        return JsonResponse({"detail": "Method not allowed"}, status=405)
+        return ORJSONResponse({"detail": "Method not allowed"}, status=405)
 
 
 @csrf_exempt
 def translate_view(request: HttpRequest):
     """Translate text between English and German."""
     if request.method != "POST":
-        return JsonResponse({"detail": "Method not allowed"}, status=405)
+        return ORJSONResponse({"detail": "Method not allowed"}, status=405)
 
     try:
         data = json.loads(request.body or "{}")
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON"}, status=400)
+        return ORJSONResponse({"detail": "Invalid JSON"}, status=400)
 
     texts = data.get("texts") or ([] if data.get("text") is None else [data["text"]])
     target_language = (data.get("target_language") or "de").lower()
     source_language = data.get("source_language")
 
     if not texts or not isinstance(texts, list):
-        return JsonResponse({"detail": "Field 'texts' (array) or 'text' (string) is required"}, status=400)
+        return ORJSONResponse({"detail": "Field 'texts' (array) or 'text' (string) is required"}, status=400)
 
     if not target_language:
-        return JsonResponse({"detail": "target_language is required"}, status=400)
+        return ORJSONResponse({"detail": "target_language is required"}, status=400)
 
     try:
         translations = _translate_with_google(texts, target_language, source_language)
     except Exception as exc:  # noqa: BLE001
-        return JsonResponse({"detail": str(exc)}, status=500)
+        return ORJSONResponse({"detail": str(exc)}, status=500)
 
-    return JsonResponse({"translations": translations})
\ No newline at end of file
+    return ORJSONResponse({"translations": translations})
\ No newline at end of file